@@ -17,16 +17,6 @@ from typing import Any, Set, cast
 import bpy
 from bpy.app.handlers import persistent
 
-from io_scene_webaverse.vrm import editor, exporter, importer, shader, version
-from io_scene_webaverse.vrm.editor import glsl_drawer, make_armature, vrm_helper
-from io_scene_webaverse.vrm.exporter import validation
-from io_scene_webaverse.vrm.lang import translation_dictionary
-from io_scene_webaverse.vrm.preferences import (
-    VrmAddonPreferences,
-    addon_package_name,
-    use_experimental_vrm_component_ui,
-)
-
 bl_info = {
     'name': 'Webaverse Exporter',
     'author': 'Webaverse',
@@ -48,25 +38,27 @@ def get_version_string():
 # Script reloading (if the user calls 'Reload Scripts' from Blender)
 #
 
-def reload_package(module_dict_main):
+def reload_package(_module_dict_main):
     import importlib
-    from pathlib import Path
-
-    def reload_package_recursive(current_dir, module_dict):
-        for path in current_dir.iterdir():
-            if "__init__" in str(path) or path.stem not in module_dict:
-                continue
+    import sys
 
-            if path.is_file() and path.suffix == ".py":
-                importlib.reload(module_dict[path.stem])
-            elif path.is_dir():
-                reload_package_recursive(path, module_dict[path.stem].__dict__)
+    # sys.modules already knows every loaded submodule, no need to walk the disk.
+    # The package itself is skipped: it is the module being reloaded right now.
+    prefix = __package__ + '.'
+    modules = {name: module for name, module in sys.modules.items()
+               if name.startswith(prefix) and module is not None}
 
-    reload_package_recursive(Path(__file__).parent, module_dict_main)
+    # Deepest modules first, so their importers pick up the reloaded versions
+    for name in sorted(modules, key=lambda name: -name.count('.')):
+        importlib.reload(modules[name])
 
 
-if "bpy" in locals():
+# bpy is imported above, so test a name only set once this module has run
+if "_package_loaded" in locals():
     reload_package(locals())
+_package_loaded = True
+
+import logging
 
 import bpy
 from bpy.props import (StringProperty,
@@ -77,6 +69,21 @@ from bpy.props import (StringProperty,
 from bpy.types import Operator
 from bpy_extras.io_utils import ImportHelper, ExportHelper
 
+from io_scene_webaverse.vrm import editor, exporter, importer, shader, version
+from io_scene_webaverse.vrm.editor import glsl_drawer, make_armature, vrm_helper
+from io_scene_webaverse.vrm.exporter import validation
+from io_scene_webaverse.vrm.lang import translation_dictionary
+from io_scene_webaverse.vrm.preferences import (
+    VrmAddonPreferences,
+    addon_package_name,
+    use_experimental_vrm_component_ui,
+)
+
+from io_scene_webaverse.io.com import gltf2_io_draco_compression_extension
+
+# The Draco library does not come and go while Blender runs, probe it once
+_DRACO_AVAILABLE = gltf2_io_draco_compression_extension.dll_exists()
+
 
 #
 #  Functions / Classes.
@@ -84,6 +91,94 @@ from bpy_extras.io_utils import ImportHelper, ExportHelper
 
 extension_panel_unregister_functors = []
 
+# Hooks registered through register_user_extension()
+_REGISTERED_EXTENSIONS = []
+
+
+def register_user_extension(addon_name, extension_ctor=None, pre=None, post=None, panel=None):
+    """
+    Register glTF2 export hooks without relying on the addon scan.
+
+    The addon named addon_name is no longer scanned for
+    glTF2ExportUserExtension(s) / glTF2_pre_export_callback /
+    glTF2_post_export_callback attributes. Other enabled addons still are.
+
+    :param addon_name: module name of the registering addon, usually its __package__
+    :param extension_ctor: called on each export to create the user extension
+    :param pre: callback run with export_settings before the export
+    :param post: callback run with export_settings after the export
+    :param panel: function registering the extension panel, returning its unregister function
+    :return: handle to pass to unregister_user_extension()
+    """
+    if not isinstance(addon_name, str) or not addon_name:
+        raise TypeError("addon_name must be the module name of the registering addon")
+    if extension_ctor is None and pre is None and post is None and panel is None:
+        raise TypeError("register_user_extension() needs at least one hook")
+    hooks = ([extension_ctor] if extension_ctor is not None else [], panel, pre, post)
+    handle = (addon_name, hooks)
+    _REGISTERED_EXTENSIONS.append(handle)
+    return handle
+
+
+def unregister_user_extension(handle):
+    """Remove hooks previously added with register_user_extension()."""
+    _REGISTERED_EXTENSIONS.remove(handle)
+
+
+def _addon_hooks(module):
+    """Return (extension_ctors, register_panel, pre_export_callback, post_export_callback) of an addon module."""
+    extension_ctors = []
+    if hasattr(module, 'glTF2ExportUserExtension'):
+        extension_ctors.append(module.glTF2ExportUserExtension)
+    if hasattr(module, 'glTF2ExportUserExtensions'):
+        extension_ctors.extend(module.glTF2ExportUserExtensions)
+    register_panel = getattr(module, 'register_panel', None) if extension_ctors else None
+    return (
+        extension_ctors,
+        register_panel,
+        getattr(module, 'glTF2_pre_export_callback', None),
+        getattr(module, 'glTF2_post_export_callback', None),
+    )
+
+
+def _user_extension_hooks():
+    """Yield the registered glTF2 hooks, then those found on the other enabled addon modules."""
+    import sys
+    modules = sys.modules
+    registered = set()
+    for addon_name, hooks in _REGISTERED_EXTENSIONS:
+        registered.add(addon_name)
+        yield hooks
+    for addon_name in tuple(bpy.context.preferences.addons.keys()):
+        if addon_name in registered:
+            continue
+        module = modules.get(addon_name)
+        if module is None:
+            continue
+        yield _addon_hooks(module)
+
+
+def _collect_user_extensions():
+    """
+    Return the glTF2 hooks of all enabled addons, in a single pass.
+
+    :return: (extension_ctors, panel_registerers, pre_export_callbacks, post_export_callbacks)
+    """
+    extension_ctors = []
+    panel_registerers = []
+    pre_export_callbacks = []
+    post_export_callbacks = []
+    for hooks in _user_extension_hooks():
+        ctors, register_panel, pre_export_callback, post_export_callback = hooks
+        extension_ctors.extend(ctors)
+        if register_panel is not None:
+            panel_registerers.append(register_panel)
+        if pre_export_callback is not None:
+            pre_export_callbacks.append(pre_export_callback)
+        if post_export_callback is not None:
+            post_export_callbacks.append(post_export_callback)
+    return extension_ctors, panel_registerers, pre_export_callbacks, post_export_callbacks
+
 
 def on_export_format_changed(self, context):
     # Update the file extension when the format (.glb/.gltf) changes
@@ -102,26 +197,191 @@ def on_export_format_changed(self, context):
             bpy.ops.file.filenum(increment=1)
 
 
+_exporter_module = None
+
+
+def _get_exporter():
+    # Imported on first export only, then kept for the following ones
+    global _exporter_module
+    if _exporter_module is None:
+        from .blender.exp import gltf2_blender_export
+        _exporter_module = gltf2_blender_export
+    return _exporter_module
+
+
+_importer_modules = None
+
+
+def _get_importer():
+    # Same as _get_exporter(), returns (gltf2_io_gltf, gltf2_blender_gltf)
+    global _importer_modules
+    if _importer_modules is None:
+        from .io.imp import gltf2_io_gltf
+        from .blender.imp import gltf2_blender_gltf
+        _importer_modules = (gltf2_io_gltf, gltf2_blender_gltf)
+    return _importer_modules
+
+
+# Operator properties copied as-is into export_settings
+_SETTINGS_MAP = {
+    'export_format': 'gltf_format',
+    'export_image_format': 'gltf_image_format',
+    'export_copyright': 'gltf_copyright',
+    'export_texcoords': 'gltf_texcoords',
+    'export_normals': 'gltf_normals',
+    'export_materials': 'gltf_materials',
+    'export_colors': 'gltf_colors',
+    'export_cameras': 'gltf_cameras',
+    'export_extras': 'gltf_extras',
+    'export_yup': 'gltf_yup',
+    'export_apply': 'gltf_apply',
+    'export_current_frame': 'gltf_current_frame',
+    'export_animations': 'gltf_animations',
+    'export_frame_range': 'gltf_frame_range',
+    'export_force_sampling': 'gltf_force_sampling',
+    'export_def_bones': 'gltf_def_bones',
+    'export_nla_strips': 'gltf_nla_strips',
+    'export_skins': 'gltf_skins',
+    'export_all_influences': 'gltf_all_vertex_influences',
+    'export_frame_step': 'gltf_frame_step',
+    'export_morph': 'gltf_morph',
+    'export_morph_normal': 'gltf_morph_normal',
+    'export_morph_tangent': 'gltf_morph_tangent',
+    'export_lights': 'gltf_lights',
+    'export_displacement': 'gltf_displacement',
+}
+
+# Same, only used when the Draco library is available
+_DRACO_SETTINGS_MAP = {
+    'export_draco_mesh_compression_enable': 'gltf_draco_mesh_compression',
+    'export_draco_mesh_compression_level': 'gltf_draco_mesh_compression_level',
+    'export_draco_position_quantization': 'gltf_draco_position_quantization',
+    'export_draco_normal_quantization': 'gltf_draco_normal_quantization',
+    'export_draco_texcoord_quantization': 'gltf_draco_texcoord_quantization',
+    'export_draco_color_quantization': 'gltf_draco_color_quantization',
+    'export_draco_generic_quantization': 'gltf_draco_generic_quantization',
+}
+
+# Keys always filled by execute(), so that export_settings is created at its final size
+_EXPORT_SETTINGS_TEMPLATE = dict.fromkeys((
+    'timestamp',
+    'gltf_filepath',
+    'gltf_filedirectory',
+    'gltf_texturedirectory',
+    *_SETTINGS_MAP.values(),
+    'gltf_draco_mesh_compression',
+    'gltf_tangents',
+    'gltf_selected',
+    'gltf_layers',
+    'gltf_binary',
+    'gltf_binaryfilename',
+    'gltf_user_extensions',
+    'pre_export_callbacks',
+    'post_export_callbacks',
+))
+
+
+# EnumProperty items, built once at import
+_FORMAT_ITEMS = (
+    ('GLB', 'glTF Binary (.glb)',
+     'Exports a single file, with all data packed in binary form. '
+     'Most efficient and portable, but more difficult to edit later'),
+    ('GLTF_EMBEDDED', 'glTF Embedded (.gltf)',
+     'Exports a single file, with all data packed in JSON. '
+     'Less efficient than binary, but easier to edit later'),
+    ('GLTF_SEPARATE', 'glTF Separate (.gltf + .bin + textures)',
+     'Exports multiple files, with separate JSON, binary and texture data. '
+     'Easiest to edit later'),
+)
+
+_UI_TAB_ITEMS = (
+    ('GENERAL', "General", "General settings"),
+    ('MESHES', "Meshes", "Mesh settings"),
+    ('OBJECTS', "Objects", "Object settings"),
+    ('ANIMATION', "Animation", "Animation settings"),
+)
+
+_IMAGE_FORMAT_ITEMS = (
+    ('AUTO', 'Automatic',
+     'Save PNGs as PNGs and JPEGs as JPEGs. '
+     'If neither one, use PNG'),
+    ('JPEG', 'JPEG Format (.jpg)',
+     'Save images as JPEGs. (Images that need alpha are saved as PNGs though.) '
+     'Be aware of a possible loss in quality'),
+)
+
+_DRACO_SPEED_PRESET_ITEMS = (
+    ('FAST', 'Fast',
+     'Fastest encoding (compression level 1)'),
+    ('BALANCED', 'Balanced',
+     'Good compression at a moderate encoding cost (compression level 3)'),
+    ('MAX', 'Max',
+     'Smallest output, slowest encoding (compression level 6)'),
+)
+
+_MATERIALS_ITEMS = (
+    ('EXPORT', 'Export',
+     'Export all materials used by included objects'),
+    ('PLACEHOLDER', 'Placeholder',
+     'Do not export materials, but write multiple primitive groups per mesh, keeping material slot information'),
+    ('NONE', 'No export',
+     'Do not export materials, and combine mesh primitive groups, losing material slot information'),
+)
+
+
+def on_export_fast_changed(self, context):
+    # Turn off the export features that are known to be slow
+    if self.export_fast:
+        self.export_apply = False
+        self.export_force_sampling = False
+        self.export_morph_normal = False
+        self.export_morph_tangent = False
+        self.export_tangents = False
+
+
+def on_draco_speed_preset_changed(self, context):
+    # Map the speed preset onto the Draco compression level
+    self.export_draco_mesh_compression_level = {
+        'FAST': 1,
+        'BALANCED': 3,
+        'MAX': 6,
+    }[self.export_draco_speed_preset]
+
+
+_EXPORT_PROP_DEFAULTS = {}
+
+
+def _export_prop_defaults(operator):
+    # Default values of the stored export properties, read once from RNA
+    if not _EXPORT_PROP_DEFAULTS:
+        properties = operator.bl_rna.properties
+        for name in operator._EXPORT_PROP_NAMES:
+            _EXPORT_PROP_DEFAULTS[name] = properties[name].default
+    return _EXPORT_PROP_DEFAULTS
+
+
+def _poll_is_gltf(context):
+    # Shared poll of the export panels: only show them for this exporter
+    operator = context.space_data.active_operator
+    return operator is not None and operator.bl_idname == "EXPORT_SCENE_OT_gltf"
+
+
+def _begin_draw(panel, context):
+    # Shared draw preamble of the export panels
+    layout = panel.layout
+    layout.use_property_split = True
+    layout.use_property_decorate = False  # No animation.
+    return layout, context.space_data.active_operator
+
+
 class ExportGLTF2_Base:
     # TODO: refactor to avoid boilerplate
 
-    def __init__(self):
-        from io_scene_webaverse.io.com import gltf2_io_draco_compression_extension
-        self.is_draco_available = gltf2_io_draco_compression_extension.dll_exists()
-
     bl_options = {'PRESET'}
 
     export_format: EnumProperty(
         name='Format',
-        items=(('GLB', 'glTF Binary (.glb)',
-                'Exports a single file, with all data packed in binary form. '
-                'Most efficient and portable, but more difficult to edit later'),
-               ('GLTF_EMBEDDED', 'glTF Embedded (.gltf)',
-                'Exports a single file, with all data packed in JSON. '
-                'Less efficient than binary, but easier to edit later'),
-               ('GLTF_SEPARATE', 'glTF Separate (.gltf + .bin + textures)',
-                'Exports multiple files, with separate JSON, binary and texture data. '
-                'Easiest to edit later')),
+        items=_FORMAT_ITEMS,
         description=(
             'Output format and embedding options. Binary is most efficient, '
             'but JSON (embedded or separate) may be easier to edit later'
@@ -131,14 +391,19 @@ class ExportGLTF2_Base:
     )
 
     ui_tab: EnumProperty(
-        items=(('GENERAL', "General", "General settings"),
-               ('MESHES', "Meshes", "Mesh settings"),
-               ('OBJECTS', "Objects", "Object settings"),
-               ('ANIMATION', "Animation", "Animation settings")),
+        items=_UI_TAB_ITEMS,
         name="ui_tab",
         description="Export setting categories",
     )
 
+    export_fast: BoolProperty(
+        name='Fast Export',
+        description='Skip slow export features: modifiers, forced animation sampling, '
+                    'tangents and shape key normals/tangents. Images are saved as JPEGs when possible',
+        default=False,
+        update=on_export_fast_changed,
+    )
+
     export_copyright: StringProperty(
         name='Copyright',
         description='Legal rights and conditions for the model',
@@ -147,13 +412,7 @@ class ExportGLTF2_Base:
 
     export_image_format: EnumProperty(
         name='Images',
-        items=(('AUTO', 'Automatic',
-                'Save PNGs as PNGs and JPEGs as JPEGs. '
-                'If neither one, use PNG'),
-                ('JPEG', 'JPEG Format (.jpg)',
-                'Save images as JPEGs. (Images that need alpha are saved as PNGs though.) '
-                'Be aware of a possible loss in quality'),
-               ),
+        items=_IMAGE_FORMAT_ITEMS,
         description=(
             'Output format for images. PNG is lossless and generally preferred, but JPEG might be preferable for web '
             'applications due to the smaller file size'
@@ -185,10 +444,18 @@ class ExportGLTF2_Base:
         default=False
     )
 
+    export_draco_speed_preset: EnumProperty(
+        name='Speed',
+        items=_DRACO_SPEED_PRESET_ITEMS,
+        description='Trade-off between Draco encoding speed and output size',
+        default='BALANCED',
+        update=on_draco_speed_preset_changed,
+    )
+
     export_draco_mesh_compression_level: IntProperty(
         name='Compression level',
         description='Compression level (0 = most speed, 6 = most compression, higher values currently not supported)',
-        default=6,
+        default=3,
         min=0,
         max=6
     )
@@ -219,16 +486,18 @@ class ExportGLTF2_Base:
 
     export_draco_color_quantization: IntProperty(
         name='Color quantization bits',
-        description='Quantization bits for color values (0 = no quantization)',
-        default=10,
+        description='Quantization bits for color values (0 = no quantization). '
+                    '8 or 16 bits match byte/short accessors, values in between waste bits',
+        default=8,
         min=0,
         max=30
     )
 
     export_draco_generic_quantization: IntProperty(
         name='Generic quantization bits',
-        description='Quantization bits for generic coordinate values like weights or joints (0 = no quantization)',
-        default=12,
+        description='Quantization bits for generic coordinate values like weights or joints (0 = no quantization). '
+                    '8 or 16 bits match byte/short accessors, values in between waste bits',
+        default=8,
         min=0,
         max=30
     )
@@ -241,12 +510,7 @@ class ExportGLTF2_Base:
 
     export_materials: EnumProperty(
         name='Materials',
-        items=(('EXPORT', 'Export',
-        'Export all materials used by included objects'),
-        ('PLACEHOLDER', 'Placeholder',
-        'Do not export materials, but write multiple primitive groups per mesh, keeping material slot information'),
-        ('NONE', 'No export',
-        'Do not export materials, and combine mesh primitive groups, losing material slot information')),
+        items=_MATERIALS_ITEMS,
         description='Export materials ',
         default='EXPORT'
     )
@@ -395,37 +659,47 @@ class ExportGLTF2_Base:
     # Custom scene property for saving settings
     scene_key = "webaverseExportSettings"
 
+    # Properties stored in the scene by save_settings
+    _EXPORT_PROP_NAMES = tuple(name for name in __annotations__
+                               if name.startswith("export_") or name == "use_selection")
+
     #
 
     def check(self, _context):
         # Ensure file extension matches format
         import os
-        filename = os.path.basename(self.filepath)
-        if filename:
-            filepath = self.filepath
-            desired_ext = '.glb' if self.export_format == 'GLB' else '.gltf'
-
-            stem, ext = os.path.splitext(filename)
-            if stem.startswith('.') and not ext:
-                stem, ext = '', stem
-
-            ext_lower = ext.lower()
-            if ext_lower not in ['.glb', '.gltf']:
-                filepath = filepath + desired_ext
-            elif ext_lower != desired_ext:
-                filepath = filepath[:-len(ext)]  # strip off ext
-                filepath += desired_ext
-
-            if filepath != self.filepath:
-                self.filepath = filepath
-                return True
+        directory, filename = os.path.split(self.filepath)
+        if not filename:
+            return False
+
+        desired_ext = '.glb' if self.export_format == 'GLB' else '.gltf'
+        stem, ext = os.path.splitext(filename)
+        if stem.startswith('.') and not ext:
+            stem, ext = '', stem
+
+        ext_lower = ext.lower()
+        if ext_lower not in ('.glb', '.gltf'):
+            filepath = self.filepath + desired_ext
+        elif ext_lower != desired_ext:
+            filepath = os.path.join(directory, stem + desired_ext)
+        else:
+            return False
 
-        return False
+        self.filepath = filepath
+        return True
 
     def invoke(self, context, event):
         settings = context.scene.get(self.scene_key)
         self.will_save_settings = False
-        if settings:
+        if settings is not None:  # May be empty when only defaults were saved
+            # Only non-default values are stored: reset the others, rather than
+            # keeping what the last export (maybe of another scene) left behind
+            stored = set(settings.keys())
+            if "export_selected" in stored:
+                stored.add("use_selection")
+            for name in self._EXPORT_PROP_NAMES:
+                if name not in stored:
+                    self.property_unset(name)
             try:
                 for (k, v) in settings.items():
                     if k == "export_selected": # Back compatibility for export_selected --> use_selection
@@ -441,30 +715,28 @@ class ExportGLTF2_Base:
                 self.report({"ERROR"}, "Loading export settings failed. Removed corrupted settings")
                 del context.scene[self.scene_key]
 
-        import sys
-        preferences = bpy.context.preferences
-        for addon_name in preferences.addons.keys():
+        for register_panel in _collect_user_extensions()[1]:
             try:
-                if hasattr(sys.modules[addon_name], 'glTF2ExportUserExtension') or hasattr(sys.modules[addon_name], 'glTF2ExportUserExtensions'):
-                    extension_panel_unregister_functors.append(sys.modules[addon_name].register_panel())
+                extension_panel_unregister_functors.append(register_panel())
             except Exception:
                 pass
 
-        self.has_active_extenions = len(extension_panel_unregister_functors) > 0
         return ExportHelper.invoke(self, context, event)
 
     def save_settings(self, context):
-        # find all export_ props
-        all_props = self.properties
-        export_props = {x: getattr(self, x) for x in dir(all_props)
-                        if (x.startswith("export_") or x == "use_selection") and all_props.get(x) is not None}
+        # only store the export_ props that differ from their default
+        defaults = _export_prop_defaults(self)
+        export_props = {}
+        for name in self._EXPORT_PROP_NAMES:
+            value = getattr(self, name)
+            if value != defaults[name]:
+                export_props[name] = value
 
         context.scene[self.scene_key] = export_props
 
     def execute(self, context):
         import os
         import datetime
-        from .blender.exp import gltf2_blender_export
 
         if self.will_save_settings:
             self.save_settings(context)
@@ -472,7 +744,7 @@ class ExportGLTF2_Base:
         self.check(context)  # ensure filepath has the right extension
 
         # All custom export settings are stored in this container.
-        export_settings = {}
+        export_settings = _EXPORT_SETTINGS_TEMPLATE.copy()
 
         export_settings['timestamp'] = datetime.datetime.now()
 
@@ -483,27 +755,19 @@ class ExportGLTF2_Base:
             self.export_texture_dir,
         )
 
-        export_settings['gltf_format'] = self.export_format
-        export_settings['gltf_image_format'] = self.export_image_format
-        export_settings['gltf_copyright'] = self.export_copyright
-        export_settings['gltf_texcoords'] = self.export_texcoords
-        export_settings['gltf_normals'] = self.export_normals
-        export_settings['gltf_tangents'] = self.export_tangents and self.export_normals
+        for prop_name, setting_name in _SETTINGS_MAP.items():
+            export_settings[setting_name] = getattr(self, prop_name)
 
-        if self.is_draco_available:
-            export_settings['gltf_draco_mesh_compression'] = self.export_draco_mesh_compression_enable
-            export_settings['gltf_draco_mesh_compression_level'] = self.export_draco_mesh_compression_level
-            export_settings['gltf_draco_position_quantization'] = self.export_draco_position_quantization
-            export_settings['gltf_draco_normal_quantization'] = self.export_draco_normal_quantization
-            export_settings['gltf_draco_texcoord_quantization'] = self.export_draco_texcoord_quantization
-            export_settings['gltf_draco_color_quantization'] = self.export_draco_color_quantization
-            export_settings['gltf_draco_generic_quantization'] = self.export_draco_generic_quantization
+        if _DRACO_AVAILABLE:
+            for prop_name, setting_name in _DRACO_SETTINGS_MAP.items():
+                export_settings[setting_name] = getattr(self, prop_name)
         else:
             export_settings['gltf_draco_mesh_compression'] = False
 
-        export_settings['gltf_materials'] = self.export_materials
-        export_settings['gltf_colors'] = self.export_colors
-        export_settings['gltf_cameras'] = self.export_cameras
+        # Settings depending on more than one property
+        export_settings['gltf_tangents'] = self.export_tangents and self.export_normals
+        if self.export_fast:
+            export_settings['gltf_image_format'] = 'JPEG'
 
         # compatibility after renaming export_selected to use_selection
         if self.export_selected is True:
@@ -514,75 +778,31 @@ class ExportGLTF2_Base:
 
         # export_settings['gltf_selected'] = self.use_selection This can be uncomment when removing compatibility of export_selected
         export_settings['gltf_layers'] = True  # self.export_layers
-        export_settings['gltf_extras'] = self.export_extras
-        export_settings['gltf_yup'] = self.export_yup
-        export_settings['gltf_apply'] = self.export_apply
-        export_settings['gltf_current_frame'] = self.export_current_frame
-        export_settings['gltf_animations'] = self.export_animations
-        if self.export_animations:
-            export_settings['gltf_frame_range'] = self.export_frame_range
-            export_settings['gltf_force_sampling'] = self.export_force_sampling
-            if self.export_force_sampling:
-                export_settings['gltf_def_bones'] = self.export_def_bones
-            else:
-                export_settings['gltf_def_bones'] = False
-            export_settings['gltf_nla_strips'] = self.export_nla_strips
-        else:
+        if not self.export_animations:
             export_settings['gltf_frame_range'] = False
             export_settings['gltf_move_keyframes'] = False
             export_settings['gltf_force_sampling'] = False
             export_settings['gltf_def_bones'] = False
-        export_settings['gltf_skins'] = self.export_skins
-        if self.export_skins:
-            export_settings['gltf_all_vertex_influences'] = self.export_all_influences
-        else:
+        elif not self.export_force_sampling:
+            export_settings['gltf_def_bones'] = False
+        if not self.export_skins:
             export_settings['gltf_all_vertex_influences'] = False
-        export_settings['gltf_frame_step'] = self.export_frame_step
-        export_settings['gltf_morph'] = self.export_morph
-        if self.export_morph:
-            export_settings['gltf_morph_normal'] = self.export_morph_normal
-        else:
+        if not self.export_morph:
             export_settings['gltf_morph_normal'] = False
-        if self.export_morph and self.export_morph_normal:
-            export_settings['gltf_morph_tangent'] = self.export_morph_tangent
-        else:
+        if not (self.export_morph and self.export_morph_normal):
             export_settings['gltf_morph_tangent'] = False
 
-        export_settings['gltf_lights'] = self.export_lights
-        export_settings['gltf_displacement'] = self.export_displacement
-
         export_settings['gltf_binary'] = bytearray()
         export_settings['gltf_binaryfilename'] = (
             os.path.splitext(os.path.basename(self.filepath))[0] + '.bin'
         )
 
-        user_extensions = []
-        pre_export_callbacks = []
-        post_export_callbacks = []
-
-        import sys
-        preferences = bpy.context.preferences
-        for addon_name in preferences.addons.keys():
-            try:
-                module = sys.modules[addon_name]
-            except Exception:
-                continue
-            if hasattr(module, 'glTF2ExportUserExtension'):
-                extension_ctor = module.glTF2ExportUserExtension
-                user_extensions.append(extension_ctor())
-            if hasattr(module, 'glTF2ExportUserExtensions'):
-                extension_ctors = module.glTF2ExportUserExtensions
-                for extension_ctor in extension_ctors:
-                    user_extensions.append(extension_ctor())
-            if hasattr(module, 'glTF2_pre_export_callback'):
-                pre_export_callbacks.append(module.glTF2_pre_export_callback)
-            if hasattr(module, 'glTF2_post_export_callback'):
-                post_export_callbacks.append(module.glTF2_post_export_callback)
-        export_settings['gltf_user_extensions'] = user_extensions
+        extension_ctors, _, pre_export_callbacks, post_export_callbacks = _collect_user_extensions()
+        export_settings['gltf_user_extensions'] = [extension_ctor() for extension_ctor in extension_ctors]
         export_settings['pre_export_callbacks'] = pre_export_callbacks
         export_settings['post_export_callbacks'] = post_export_callbacks
 
-        return gltf2_blender_export.save(context, export_settings)
+        return _get_exporter().save(context, export_settings)
 
     def draw(self, context):
         pass # Is needed to get panels available
@@ -597,19 +817,12 @@ class GLTF_PT_export_main(bpy.types.Panel):
 
     @classmethod
     def poll(cls, context):
-        sfile = context.space_data
-        operator = sfile.active_operator
-
-        return operator.bl_idname == "EXPORT_SCENE_OT_gltf"
+        return _poll_is_gltf(context)
 
     def draw(self, context):
-        layout = self.layout
-        layout.use_property_split = True
-        layout.use_property_decorate = False  # No animation.
-
-        sfile = context.space_data
-        operator = sfile.active_operator
+        layout, operator = _begin_draw(self, context)
 
+        layout.prop(operator, 'export_fast')
         layout.prop(operator, 'export_format')
         if operator.export_format == 'GLTF_SEPARATE':
             layout.prop(operator, 'export_texture_dir', icon='FILE_FOLDER')
@@ -626,18 +839,10 @@ class GLTF_PT_export_include(bpy.types.Panel):
 
     @classmethod
     def poll(cls, context):
-        sfile = context.space_data
-        operator = sfile.active_operator
-
-        return operator.bl_idname == "EXPORT_SCENE_OT_gltf"
+        return _poll_is_gltf(context)
 
     def draw(self, context):
-        layout = self.layout
-        layout.use_property_split = True
-        layout.use_property_decorate = False  # No animation.
-
-        sfile = context.space_data
-        operator = sfile.active_operator
+        layout, operator = _begin_draw(self, context)
 
         col = layout.column(heading = "Limit to", align = True)
         col.prop(operator, 'use_selection')
@@ -657,18 +862,10 @@ class GLTF_PT_export_transform(bpy.types.Panel):
 
     @classmethod
     def poll(cls, context):
-        sfile = context.space_data
-        operator = sfile.active_operator
-
-        return operator.bl_idname == "EXPORT_SCENE_OT_gltf"
+        return _poll_is_gltf(context)
 
     def draw(self, context):
-        layout = self.layout
-        layout.use_property_split = True
-        layout.use_property_decorate = False  # No animation.
-
-        sfile = context.space_data
-        operator = sfile.active_operator
+        layout, operator = _begin_draw(self, context)
 
         layout.prop(operator, 'export_yup')
 
@@ -682,18 +879,10 @@ class GLTF_PT_export_geometry(bpy.types.Panel):
 
     @classmethod
     def poll(cls, context):
-        sfile = context.space_data
-        operator = sfile.active_operator
-
-        return operator.bl_idname == "EXPORT_SCENE_OT_gltf"
+        return _poll_is_gltf(context)
 
     def draw(self, context):
-        layout = self.layout
-        layout.use_property_split = True
-        layout.use_property_decorate = False  # No animation.
-
-        sfile = context.space_data
-        operator = sfile.active_operator
+        layout, operator = _begin_draw(self, context)
 
         layout.prop(operator, 'export_apply')
         layout.prop(operator, 'export_texcoords')
@@ -715,16 +904,9 @@ class GLTF_PT_export_geometry_compression(bpy.types.Panel):
     bl_parent_id = "GLTF_PT_export_geometry"
     bl_options = {'DEFAULT_CLOSED'}
 
-    def __init__(self):
-        from io_scene_webaverse.io.com import gltf2_io_draco_compression_extension
-        self.is_draco_available = gltf2_io_draco_compression_extension.dll_exists(quiet=True)
-
     @classmethod
     def poll(cls, context):
-        sfile = context.space_data
-        operator = sfile.active_operator
-        if operator.is_draco_available:
-            return operator.bl_idname == "EXPORT_SCENE_OT_gltf"
+        return _DRACO_AVAILABLE and _poll_is_gltf(context)
 
     def draw_header(self, context):
         sfile = context.space_data
@@ -732,15 +914,10 @@ class GLTF_PT_export_geometry_compression(bpy.types.Panel):
         self.layout.prop(operator, "export_draco_mesh_compression_enable", text="")
 
     def draw(self, context):
-        layout = self.layout
-        layout.use_property_split = True
-        layout.use_property_decorate = False  # No animation.
-
-        sfile = context.space_data
-        operator = sfile.active_operator
+        layout, operator = _begin_draw(self, context)
 
         layout.active = operator.export_draco_mesh_compression_enable
-        layout.prop(operator, 'export_draco_mesh_compression_level')
+        layout.prop(operator, 'export_draco_speed_preset')
 
         col = layout.column(align=True)
         col.prop(operator, 'export_draco_position_quantization', text="Quantize Position")
@@ -750,6 +927,24 @@ class GLTF_PT_export_geometry_compression(bpy.types.Panel):
         col.prop(operator, 'export_draco_generic_quantization', text="Generic")
 
 
+class GLTF_PT_export_geometry_compression_advanced(bpy.types.Panel):
+    bl_space_type = 'FILE_BROWSER'
+    bl_region_type = 'TOOL_PROPS'
+    bl_label = "Advanced"
+    bl_parent_id = "GLTF_PT_export_geometry_compression"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    @classmethod
+    def poll(cls, context):
+        return _poll_is_gltf(context)
+
+    def draw(self, context):
+        layout, operator = _begin_draw(self, context)
+
+        layout.active = operator.export_draco_mesh_compression_enable
+        layout.prop(operator, 'export_draco_mesh_compression_level')
+
+
 class GLTF_PT_export_animation(bpy.types.Panel):
     bl_space_type = 'FILE_BROWSER'
     bl_region_type = 'TOOL_PROPS'
@@ -759,18 +954,10 @@ class GLTF_PT_export_animation(bpy.types.Panel):
 
     @classmethod
     def poll(cls, context):
-        sfile = context.space_data
-        operator = sfile.active_operator
-
-        return operator.bl_idname == "EXPORT_SCENE_OT_gltf"
+        return _poll_is_gltf(context)
 
     def draw(self, context):
-        layout = self.layout
-        layout.use_property_split = True
-        layout.use_property_decorate = False  # No animation.
-
-        sfile = context.space_data
-        operator = sfile.active_operator
+        layout, operator = _begin_draw(self, context)
 
         layout.prop(operator, 'export_current_frame')
 
@@ -784,10 +971,7 @@ class GLTF_PT_export_animation_export(bpy.types.Panel):
 
     @classmethod
     def poll(cls, context):
-        sfile = context.space_data
-        operator = sfile.active_operator
-
-        return operator.bl_idname == "EXPORT_SCENE_OT_gltf"
+        return _poll_is_gltf(context)
 
     def draw_header(self, context):
         sfile = context.space_data
@@ -795,12 +979,7 @@ class GLTF_PT_export_animation_export(bpy.types.Panel):
         self.layout.prop(operator, "export_animations", text="")
 
     def draw(self, context):
-        layout = self.layout
-        layout.use_property_split = True
-        layout.use_property_decorate = False  # No animation.
-
-        sfile = context.space_data
-        operator = sfile.active_operator
+        layout, operator = _begin_draw(self, context)
 
         layout.active = operator.export_animations
 
@@ -823,10 +1002,7 @@ class GLTF_PT_export_animation_shapekeys(bpy.types.Panel):
 
     @classmethod
     def poll(cls, context):
-        sfile = context.space_data
-        operator = sfile.active_operator
-
-        return operator.bl_idname == "EXPORT_SCENE_OT_gltf"
+        return _poll_is_gltf(context)
 
     def draw_header(self, context):
         sfile = context.space_data
@@ -834,12 +1010,7 @@ class GLTF_PT_export_animation_shapekeys(bpy.types.Panel):
         self.layout.prop(operator, "export_morph", text="")
 
     def draw(self, context):
-        layout = self.layout
-        layout.use_property_split = True
-        layout.use_property_decorate = False  # No animation.
-
-        sfile = context.space_data
-        operator = sfile.active_operator
+        layout, operator = _begin_draw(self, context)
 
         layout.active = operator.export_morph
 
@@ -858,10 +1029,7 @@ class GLTF_PT_export_animation_skinning(bpy.types.Panel):
 
     @classmethod
     def poll(cls, context):
-        sfile = context.space_data
-        operator = sfile.active_operator
-
-        return operator.bl_idname == "EXPORT_SCENE_OT_gltf"
+        return _poll_is_gltf(context)
 
     def draw_header(self, context):
         sfile = context.space_data
@@ -869,12 +1037,7 @@ class GLTF_PT_export_animation_skinning(bpy.types.Panel):
         self.layout.prop(operator, "export_skins", text="")
 
     def draw(self, context):
-        layout = self.layout
-        layout.use_property_split = True
-        layout.use_property_decorate = False  # No animation.
-
-        sfile = context.space_data
-        operator = sfile.active_operator
+        layout, operator = _begin_draw(self, context)
 
         layout.active = operator.export_skins
         layout.prop(operator, 'export_all_influences')
@@ -888,10 +1051,7 @@ class GLTF_PT_export_user_extensions(bpy.types.Panel):
 
     @classmethod
     def poll(cls, context):
-        sfile = context.space_data
-        operator = sfile.active_operator
-
-        return operator.bl_idname == "EXPORT_SCENE_OT_gltf" and operator.has_active_extenions
+        return _poll_is_gltf(context) and bool(extension_panel_unregister_functors)
 
     def draw(self, context):
         layout = self.layout
@@ -915,6 +1075,15 @@ def menu_func_export(self, context):
 def menu_func_export2(self, context):
     self.layout.operator(ExportGLTF2.bl_idname, text='Webaverse Avatar (.vrm)')
 
+# Import log level for each bpy.app.debug_value, anything else logs everything
+_LOG_LEVELS = {
+    0: logging.CRITICAL,
+    1: logging.ERROR,
+    2: logging.WARNING,
+    3: logging.INFO,
+}
+
+
 class ImportGLTF2(Operator, ImportHelper):
     """Load a glTF 2.0 file"""
     bl_idname = 'import_scene.webaverse'
@@ -1010,54 +1179,105 @@ class ImportGLTF2(Operator, ImportHelper):
 
         if self.files:
             # Multiple file import
+            gltf2_io_gltf, _ = _get_importer()
             ret = {'CANCELLED'}
             dirname = os.path.dirname(self.filepath)
-            for file in self.files:
-                path = os.path.join(dirname, file.name)
-                if self.unit_import(path, import_settings) == {'FINISHED'}:
+            paths = [os.path.join(dirname, file.name) for file in self.files]
+            for gltf_importer in self.parse_files(paths, import_settings):
+                # Parse errors were already reported
+                if gltf_importer is None:
+                    continue
+                gltf_importer.log.addHandler(gltf_importer.log_handler)
+                try:
+                    self.blender_step(gltf_importer)
                     ret = {'FINISHED'}
+                except gltf2_io_gltf.ImportError as e:
+                    self.report({'ERROR'}, e.args[0])
             return ret
         else:
             # Single file import
             return self.unit_import(self.filepath, import_settings)
 
-    def unit_import(self, filename, import_settings):
+    # Files parsed ahead of the one being created, bounds how many are held in memory
+    _PARSE_AHEAD = 2
+
+    def parse_files(self, paths, import_settings):
+        """
+        Read and check files ahead on worker threads, yielding their importers in order.
+
+        Only the file reading and glTF parsing run on worker threads, so the Blender data
+        of a file can be created on the main thread while the next ones are being parsed.
+        At most _PARSE_AHEAD files are parsed ahead, the others wait for their turn.
+        Yields None for files that failed, after reporting the error.
+        """
+        from collections import deque
+        from concurrent.futures import ThreadPoolExecutor
+        gltf2_io_gltf, _ = _get_importer()
+
+        paths = iter(paths)
+        pending = deque()
+
+        with ThreadPoolExecutor(max_workers=self._PARSE_AHEAD) as executor:
+            def submit_next():
+                path = next(paths, None)
+                if path is None:
+                    return
+                gltf_importer = gltf2_io_gltf.glTFImporter(path, import_settings)
+                # All importers share one logger, keep only the handler of the file being created
+                gltf_importer.log.removeHandler(gltf_importer.log_handler)
+                pending.append((gltf_importer, executor.submit(self.parse_step, gltf_importer)))
+
+            for _ in range(self._PARSE_AHEAD):
+                submit_next()
+
+            while pending:
+                gltf_importer, future = pending.popleft()
+                submit_next()
+                try:
+                    future.result()
+                except gltf2_io_gltf.ImportError as e:
+                    self.report({'ERROR'}, e.args[0])
+                    yield None
+                else:
+                    yield gltf_importer
+
+    @staticmethod
+    def parse_step(gltf_importer):
+        """Read and check the file. Does not touch Blender data, so it can run off the main thread."""
+        gltf_importer.read()
+        gltf_importer.checks()
+
+    @staticmethod
+    def blender_step(gltf_importer):
+        """Create the Blender data of a parsed file. Must run on the main thread."""
         import time
-        from .io.imp.gltf2_io_gltf import glTFImporter, ImportError
-        from .blender.imp.gltf2_blender_gltf import BlenderGlTF
+        _, gltf2_blender_gltf = _get_importer()
 
-        try:
-            gltf_importer = glTFImporter(filename, import_settings)
-            gltf_importer.read()
-            gltf_importer.checks()
+        print("Data are loaded, start creating Blender stuff")
 
-            print("Data are loaded, start creating Blender stuff")
+        start_time = time.time()
+        gltf2_blender_gltf.BlenderGlTF.create(gltf_importer)
+        elapsed_s = "{:.2f}s".format(time.time() - start_time)
+        print("glTF import finished in " + elapsed_s)
 
-            start_time = time.time()
-            BlenderGlTF.create(gltf_importer)
-            elapsed_s = "{:.2f}s".format(time.time() - start_time)
-            print("glTF import finished in " + elapsed_s)
+        gltf_importer.log.removeHandler(gltf_importer.log_handler)
 
-            gltf_importer.log.removeHandler(gltf_importer.log_handler)
+    def unit_import(self, filename, import_settings):
+        gltf2_io_gltf, _ = _get_importer()
+
+        try:
+            gltf_importer = gltf2_io_gltf.glTFImporter(filename, import_settings)
+            self.parse_step(gltf_importer)
+            self.blender_step(gltf_importer)
 
             return {'FINISHED'}
 
-        except ImportError as e:
+        except gltf2_io_gltf.ImportError as e:
             self.report({'ERROR'}, e.args[0])
             return {'CANCELLED'}
 
     def set_debug_log(self):
-        import logging
-        if bpy.app.debug_value == 0:
-            self.loglevel = logging.CRITICAL
-        elif bpy.app.debug_value == 1:
-            self.loglevel = logging.ERROR
-        elif bpy.app.debug_value == 2:
-            self.loglevel = logging.WARNING
-        elif bpy.app.debug_value == 3:
-            self.loglevel = logging.INFO
-        else:
-            self.loglevel = logging.NOTSET
+        self.loglevel = _LOG_LEVELS.get(bpy.app.debug_value, logging.NOTSET)
 
 
 def menu_func_import(self, context):
@@ -1065,6 +1285,8 @@ def menu_func_import(self, context):
 #    self.layout.operator(ImportGLTF2.bl_idname, text='glTF 2.0 (.glb/.gltf)')
 
 class WM_OT_gltf2AddonDisabledWarning(bpy.types.Operator):  # type: ignore[misc] # noqa: N801
+    __slots__ = ()
+
     bl_label = "glTF 2.0 add-on is disabled"
     bl_idname = "wm.gltf2_addon_disabled_warning"
     bl_options = {"REGISTER", "UNDO"}
@@ -1089,6 +1311,7 @@ classes = (
     GLTF_PT_export_transform,
     GLTF_PT_export_geometry,
     GLTF_PT_export_geometry_compression,
+    GLTF_PT_export_geometry_compression_advanced,
     GLTF_PT_export_animation,
     GLTF_PT_export_animation_export,
     GLTF_PT_export_animation_shapekeys,
@@ -1131,6 +1354,8 @@ classes = (
     editor.REQUIRED_METAS,
 )
 
+_register_classes, _unregister_classes = bpy.utils.register_classes_factory(classes)
+
 
 def add_shaders(self: Any) -> None:
         shader.add_shaders(self)
@@ -1147,8 +1372,7 @@ def set_use_experimental_vrm_component_ui(enable: bool) -> None:
             bpy.utils.unregister_class(cls)
 
 def register():
-    for c in classes:
-        bpy.utils.register_class(c)
+    _register_classes()
     # bpy.utils.register_module(__name__)
 
     # add to the export / import menu
@@ -1168,8 +1392,7 @@ def register():
 
 
 def unregister():
-    for c in classes:
-        bpy.utils.unregister_class(c)
+    _unregister_classes()
     for f in extension_panel_unregister_functors:
         f()
     extension_panel_unregister_functors.clear()
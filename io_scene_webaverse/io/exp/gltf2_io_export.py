@@ -15,82 +15,269 @@
 #
 # Imports
 #
-import requests
-import webbrowser
-
 from io_scene_webaverse.io.com.gltf2_io_debug import print_console, print_newline
+from io_scene_webaverse.io.exp import gltf2_io_upload
 
 import json
+import math
+import os
 import struct
 
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
 #
 # Globals
 #
 
+# Top-level glTF keys in the order they are written out
+_SORT_ORDER = (
+    "asset",
+    "extensionsUsed",
+    "extensionsRequired",
+    "extensions",
+    "extras",
+    "scene",
+    "scenes",
+    "nodes",
+    "cameras",
+    "animations",
+    "materials",
+    "meshes",
+    "textures",
+    "images",
+    "skins",
+    "accessors",
+    "bufferViews",
+    "samplers",
+    "buffers",
+)
+
+# GLB chunks are 4-byte aligned, JSON is padded with spaces and BIN with zeros
+_JSON_PADDING = b'   '
+_BIN_PADDING = b'\0\0\0'
+
+
+def _finite_float(value):
+    # orjson writes NaN and inf as null where json.dumps(allow_nan=False) raises. Plain
+    # floats were already checked by __fix_json, only numpy values get here unchecked
+    value = float(value)
+    if not math.isfinite(value):
+        raise ValueError("Out of range float values are not JSON compliant: " + repr(value))
+    return value
+
+
+def _finite_list(array):
+    if array.dtype.kind == 'f' and not np.isfinite(array).all():
+        raise ValueError("Out of range float values are not JSON compliant")
+    return array.tolist()
+
+
+# JSON conversions for numpy values leaking out of the gather step, looked up by exact type
+_JSON_DEFAULTS = {
+    np.ndarray: _finite_list,
+    np.bool_: bool,
+    np.float16: _finite_float,
+    np.float32: _finite_float,
+    np.float64: _finite_float,
+    np.int8: int,
+    np.int16: int,
+    np.int32: int,
+    np.int64: int,
+    np.uint8: int,
+    np.uint16: int,
+    np.uint32: int,
+    np.uint64: int,
+}
+
 #
 # Functions
 #
-from collections import OrderedDict
 
 
-def save_gltf(gltf, export_settings, encoder, glb_buffer):
-    indent = None
-    separators = (',', ':')
+def _make_json_default(encoder):
+    """
+    Build a JSON default hook: numpy values by type lookup, anything else via the encoder.
 
-    if export_settings['gltf_format'] != 'GLB':
-        indent = 4
+    :return: function usable as default= by every JSON backend
+    """
+    fallback = encoder().default
+
+    def default(obj):
+        convert = _JSON_DEFAULTS.get(type(obj))
+        if convert is not None:
+            return convert(obj)
+        return fallback(obj)
+
+    return default
+
+
+def _iov_max():
+    """Most buffers a single os.writev() call accepts."""
+    try:
+        iov_max = os.sysconf('SC_IOV_MAX')
+    except (AttributeError, ValueError, OSError):
+        iov_max = -1
+    # 16 is the POSIX minimum, used when the limit is unknown
+    return iov_max if iov_max > 0 else 16
+
+
+def _write_buffers(path, buffers):
+    """
+    Write a sequence of bytes-like objects to a file without joining them first.
+
+    Uses vectored writes where the platform supports it, in batches of at most
+    IOV_MAX buffers.
+    """
+    if not hasattr(os, 'writev'):
+        with open(path, "wb") as file:
+            for buffer in buffers:
+                file.write(buffer)
+        return
+
+    views = [memoryview(buffer).cast('B') for buffer in buffers if len(buffer) > 0]
+    iov_max = _iov_max()
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        start = 0
+        while start < len(views):
+            written = os.writev(fd, views[start:start + iov_max])
+            # writev may stop short, skip what went out and retry the remainder
+            while start < len(views) and written >= views[start].nbytes:
+                written -= views[start].nbytes
+                start += 1
+            if written > 0:
+                views[start] = views[start][written:]
+    finally:
+        os.close(fd)
+
+
+class _BufferStream:
+    """
+    Iterable request body over a list of buffers, so they are uploaded without being joined.
+
+    Exposes __len__ so requests sends a Content-Length instead of chunked encoding.
+    """
+
+    def __init__(self, buffers):
+        self.views = [memoryview(buffer).cast('B') for buffer in buffers]
+        self.length = sum(view.nbytes for view in self.views)
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        return iter(self.views)
+
+
+def _dumps_json(obj, pretty, default):
+    if pretty:
         # The comma is typically followed by a newline, so no trailing whitespace is needed on it.
-        separators = (',', ' : ')
-
-    sort_order = [
-        "asset",
-        "extensionsUsed",
-        "extensionsRequired",
-        "extensions",
-        "extras",
-        "scene",
-        "scenes",
-        "nodes",
-        "cameras",
-        "animations",
-        "materials",
-        "meshes",
-        "textures",
-        "images",
-        "skins",
-        "accessors",
-        "bufferViews",
-        "samplers",
-        "buffers"
-    ]
-    gltf_ordered = OrderedDict(sorted(gltf.items(), key=lambda item: sort_order.index(item[0])))
-    gltf_encoded = json.dumps(gltf_ordered, indent=indent, separators=separators, cls=encoder, allow_nan=False)
-
-    #
+        return json.dumps(obj, indent=4, separators=(',', ' : '), default=default, allow_nan=False).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':'), default=default, allow_nan=False).encode('utf-8')
+
+
+def _dumps_orjson(obj, pretty, default):
+    # orjson encodes straight to bytes
+    return orjson.dumps(obj, default=default, option=orjson.OPT_INDENT_2 if pretty else 0)
+
+
+def _dumps_ujson(obj, pretty, default):
+    return ujson.dumps(obj, indent=4 if pretty else 0, default=default, escape_forward_slashes=False,
+                       allow_nan=False).encode('utf-8')
+
+
+def _json_backends():
+    """
+    Available JSON backends by name, for the gltf_json_backend export setting.
+
+    :return: dict of name to dumps(obj, pretty, default) returning bytes
+    """
+    backends = {'json': _dumps_json}
+    if orjson is not None:
+        backends['orjson'] = _dumps_orjson
+    if ujson is not None:
+        backends['ujson'] = _dumps_ujson
+    return backends
+
+
+def _encode_gltf(gltf, export_settings, encoder):
+    """
+    Serialize the glTF dictionary to UTF-8 JSON bytes.
+
+    export_settings['gltf_json_backend'] may name the backend to use ('json', 'orjson'
+    or 'ujson'). By default orjson is used for GLB when installed, and json otherwise so
+    the .gltf text keeps its layout.
+    :return: the encoded JSON
+    """
+    pretty = export_settings['gltf_format'] != 'GLB'
+
+    # Plain dicts keep insertion order, so walking _SORT_ORDER is enough
+    gltf_ordered = {key: gltf[key] for key in _SORT_ORDER if key in gltf}
+
+    default = _make_json_default(encoder)
+
+    backends = _json_backends()
+    name = export_settings.get('gltf_json_backend')
+    if name is None:
+        name = 'json' if pretty or orjson is None else 'orjson'
+    elif name not in backends:
+        print_console('WARNING', "JSON backend " + str(name) + " is not available, falling back to json")
+        name = 'json'
+
+    return backends[name](gltf_ordered, pretty, default)
+
+
+def save_gltf(gltf, export_settings, encoder, glb_buffer, gltf_bytes=None):
+    """
+    Write the glTF file, and upload it when exporting GLB.
+
+    glb_buffer is either one bytes-like object or a list/tuple of them making up the BIN
+    chunk in order, so callers don't have to join their buffers first.
+
+    Callers that already hold the serialized JSON, for example when writing the same
+    document to several targets, can pass it as gltf_bytes to skip encoding here.
+    It must be UTF-8 and formatted for the chosen export format.
+    :return: True
+    """
+    if gltf_bytes is not None:
+        gltf_data = gltf_bytes
+    else:
+        gltf_data = _encode_gltf(gltf, export_settings, encoder)
+
+    path = export_settings['gltf_filepath']
 
     if export_settings['gltf_format'] != 'GLB':
-        file = open(export_settings['gltf_filepath'], "w", encoding="utf8", newline="\n")
-        file.write(gltf_encoded)
-        file.write("\n")
-        file.close()
+        # Already UTF-8 encoded, so skip the text layer
+        with open(path, "wb") as file:
+            file.write(gltf_data)
+            file.write(b"\n")
 
         binary = export_settings['gltf_binary']
         if len(binary) > 0 and not export_settings['gltf_embed_buffers']:
-            file = open(export_settings['gltf_filedirectory'] + export_settings['gltf_binaryfilename'], "wb")
-            file.write(binary)
-            file.close()
+            with open(export_settings['gltf_filedirectory'] + export_settings['gltf_binaryfilename'], "wb") as file:
+                file.write(binary)
 
     else:
-        file = open(export_settings['gltf_filepath'], "wb")
-
-        gltf_data = gltf_encoded.encode()
-        binary = glb_buffer
+        if isinstance(glb_buffer, (list, tuple)):
+            binaries = [buffer for buffer in glb_buffer if len(buffer) > 0]
+        else:
+            binaries = [glb_buffer] if len(glb_buffer) > 0 else []
 
         length_gltf = len(gltf_data)
         spaces_gltf = (4 - (length_gltf & 3)) & 3
         length_gltf += spaces_gltf
 
-        length_bin = len(binary)
+        length_bin = sum(memoryview(buffer).nbytes for buffer in binaries)
         zeros_bin = (4 - (length_bin & 3)) & 3
         length_bin += zeros_bin
 
@@ -98,41 +285,24 @@ def save_gltf(gltf, export_settings, encoder, glb_buffer):
         if length_bin > 0:
             length += 8 + length_bin
 
-        # Header (Version 2)
-        file.write('glTF'.encode())
-        file.write(struct.pack("I", 2))
-        file.write(struct.pack("I", length))
-
-        # Chunk 0 (JSON)
-        file.write(struct.pack("I", length_gltf))
-        file.write('JSON'.encode())
-        file.write(gltf_data)
-        file.write(b' ' * spaces_gltf)
+        # The payloads are written in place, only headers and padding are built here
+        # Header (Version 2) followed by the Chunk 0 (JSON) header
+        header = struct.pack('<4sIII4s', b'glTF', 2, length, length_gltf, b'JSON')
+        buffers = [header, gltf_data]
+        if spaces_gltf:
+            buffers.append(_JSON_PADDING[:spaces_gltf])
 
         # Chunk 1 (BIN)
         if length_bin > 0:
-            file.write(struct.pack("I", length_bin))
-            file.write('BIN\0'.encode())
-            file.write(binary)
-            file.write(b'\0' * zeros_bin)
-
-        file.close()
-
-        with open(file.name, 'rb') as f:
-            data = f.read()
-            print_console('INFO', "upload size: " + str(len(data)));
-            # print_console('ERROR', str(data));
-            r = requests.post('https://ipfs.exokit.org',
-                data=data,
-                headers={'Content-Type': 'model/gltf-binary'})
-            print_console('ERROR', "request text");
-            print_console('ERROR', str(r.text));
-            resJson = r.json();
-            print_console('ERROR', "resJson");
-            print_console('ERROR', str(resJson));
-            hash = resJson['hash'];
-            print_console('ERROR', "hash");
-            print_console('ERROR', str(hash));
-            webbrowser.open('https://app.webaverse.com/preview.html?hash=' + hash + '&ext=glb', new=2)
+            buffers.append(struct.pack('<I4s', length_bin, b'BIN\0'))
+            buffers += binaries
+            if zeros_bin:
+                buffers.append(_BIN_PADDING[:zeros_bin])
+
+        _write_buffers(path, buffers)
+
+        # Upload the buffers we already hold instead of reading the file back
+        data = _BufferStream(buffers)
+        gltf2_io_upload.upload(data, 'model/gltf-binary', 'glb')
 
     return True
@@ -0,0 +1,121 @@
+# Copyright 2018-2019 The glTF-Blender-IO authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+#
+# Imports
+#
+import queue
+import threading
+from concurrent.futures import Future
+
+import bpy
+
+from io_scene_webaverse.io.com.gltf2_io_debug import print_console
+
+#
+# Globals
+#
+
+UPLOAD_URL = 'https://ipfs.exokit.org'
+PREVIEW_URL = 'https://app.webaverse.com/preview.html?hash={}&ext={}'
+
+# How often the main thread checks whether the upload has finished, in seconds
+_POLL_INTERVAL = 0.25
+
+# (connect, read) timeouts in seconds, so a stalled endpoint can't keep the upload thread forever
+_TIMEOUT = (10, 300)
+
+_jobs = None
+_session = None
+
+#
+# Functions
+#
+
+
+def _get_session():
+    """
+    Shared HTTP session, so repeated exports reuse the pooled keep-alive connection.
+
+    Only touched from the single upload thread.
+    """
+    global _session
+    if _session is None:
+        # requests pulls in urllib3 and friends, only pay for it on the first upload
+        import requests
+        _session = requests.Session()
+    return _session
+
+
+def _post(data, content_type):
+    """
+    Post the data and return the IPFS hash. Runs on the upload thread.
+
+    :return: the hash of the uploaded file
+    """
+    r = _get_session().post(UPLOAD_URL,
+        data=data,
+        headers={'Content-Type': content_type},
+        timeout=_TIMEOUT)
+    print_console('INFO', "upload response: " + r.text)
+    return r.json()['hash']
+
+
+def upload(data, content_type, ext):
+    """
+    Upload an exported file in the background and open its preview when done.
+
+    The request runs on a worker thread so the UI keeps responding. Completion is
+    polled from a bpy timer, because the browser has to be opened from the main thread.
+    """
+    _submit(ext, _post, data, content_type)
+
+
+def _worker():
+    # Daemon thread running the uploads one at a time, quitting Blender never waits for it
+    while True:
+        future, post, args = _jobs.get()
+        if not future.set_running_or_notify_cancel():
+            continue
+        try:
+            result = post(*args)
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+
+
+def _submit(ext, post, *args):
+    global _jobs
+    if _jobs is None:
+        _jobs = queue.SimpleQueue()
+        threading.Thread(target=_worker, name="webaverse-upload", daemon=True).start()
+
+    future = Future()
+    _jobs.put((future, post, args))
+
+    def poll():
+        if not future.done():
+            return _POLL_INTERVAL
+        try:
+            ipfs_hash = future.result()
+        except Exception as e:
+            print_console('ERROR', "upload failed: " + str(e))
+            return None
+        import webbrowser
+        webbrowser.open(PREVIEW_URL.format(ipfs_hash, ext), new=2)
+        return None
+
+    # Persistent, so loading a file while uploading doesn't drop the poll
+    bpy.app.timers.register(poll, first_interval=_POLL_INTERVAL, persistent=True)
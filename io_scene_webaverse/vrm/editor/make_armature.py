@@ -1,13 +1,38 @@
 import json
+from dataclasses import dataclass
 from math import radians
-from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import bpy
+import numpy
 from mathutils import Matrix
 
 from ..vrm_types import Vrm0
 from .template_mesh_maker import IcypTemplateMeshMaker
 
+# VRM side prefix and index of that side in the (left, right) bone pairs
+_LR_INDEX = (("left", 0), ("right", 1))
+# (left, right) roll in degrees of mirrored bones by bone_type, others get no roll
+_MIRROR_ROLLS = {"arm": (0, 180), "leg": (90, 90)}
+_MIRROR_X = numpy.array((-1.0, 1.0, 1.0))
+_R_NEG45 = radians(-45)
+_R_45 = radians(45)
+_R_180 = radians(180)
+
+
+@dataclass
+class _BoneDesc:
+    # Planned bone, make_armature creates the edit bones once the whole layout is known
+    name: str
+    head: Tuple[float, float, float]
+    tail: Tuple[float, float, float]
+    parent: Optional["_BoneDesc"]
+    radius: float
+    roll: float
+    # Right side bones hold the left side positions until they are flipped in bulk
+    mirrored: bool = False
+    bone: Optional[bpy.types.EditBone] = None
+
 
 class ICYP_OT_MAKE_ARMATURE(bpy.types.Operator):  # type: ignore[misc] # noqa: N801
     bl_idname = "icyp.make_basic_armature"
@@ -101,10 +126,8 @@ class ICYP_OT_MAKE_ARMATURE(bpy.types.Operator):  # type: ignore[misc] # noqa: N
     armature_obj = None
 
     def execute(self, context: bpy.types.Context) -> Set[str]:
-        if (
-            context.view_layer.objects.active is not None
-            and context.view_layer.objects.active.mode != "OBJECT"
-        ):
+        # context.mode is only other than OBJECT with an active object in another mode
+        if context.mode != "OBJECT":
             bpy.ops.object.mode_set(mode="OBJECT")
         self.armature_obj, compare_dict = self.make_armature(context)
         self.setup_as_vrm(self.armature_obj, compare_dict)
@@ -114,17 +137,11 @@ class ICYP_OT_MAKE_ARMATURE(bpy.types.Operator):  # type: ignore[misc] # noqa: N
             IcypTemplateMeshMaker(self)
         return {"FINISHED"}
 
-    def float_prop(self, name: str) -> float:
-        prop = getattr(self, name)
-        if not isinstance(prop, float):
-            raise Exception(f"prop {name} is not float")
-        return prop
-
     def head_size(self) -> float:
-        return self.float_prop("tall") / self.float_prop("head_ratio")
+        return float(self.tall / self.head_ratio)
 
     def hand_size(self) -> float:
-        return self.head_size() * 0.75 * self.float_prop("hand_ratio")
+        return self.head_size() * 0.75 * self.hand_ratio
 
     def make_armature(
         self, context: bpy.types.Context
@@ -132,27 +149,20 @@ class ICYP_OT_MAKE_ARMATURE(bpy.types.Operator):  # type: ignore[misc] # noqa: N
         bpy.ops.object.add(type="ARMATURE", enter_editmode=True, location=(0, 0, 0))
         armature = context.object
 
-        bone_dic = {}
+        bone_descs: List[_BoneDesc] = []
 
         def bone_add(
             name: str,
             head_pos: Tuple[float, float, float],
             tail_pos: Tuple[float, float, float],
-            parent_bone: Optional[bpy.types.Bone] = None,
+            parent_bone: Optional[_BoneDesc] = None,
             radius: float = 0.1,
             roll: float = 0,
-        ) -> bpy.types.Bone:
-            bone_name = name + "Bone"
-            added_bone = armature.data.edit_bones.new(bone_name)
-            added_bone.head = head_pos
-            added_bone.tail = tail_pos
-            added_bone.head_radius = radius
-            added_bone.tail_radius = radius
-            added_bone.envelope_distance = 0.01
-            added_bone.roll = radians(roll)
-            if parent_bone is not None:
-                added_bone.parent = parent_bone
-            bone_dic.update({bone_name: added_bone})
+        ) -> _BoneDesc:
+            added_bone = _BoneDesc(
+                name + "Bone", head_pos, tail_pos, parent_bone, radius, roll
+            )
+            bone_descs.append(added_bone)
             return added_bone
 
         # bone_type = "leg" or "arm" for roll setting
@@ -160,17 +170,11 @@ class ICYP_OT_MAKE_ARMATURE(bpy.types.Operator):  # type: ignore[misc] # noqa: N
             base_name: str,
             right_head_pos: Tuple[float, float, float],
             right_tail_pos: Tuple[float, float, float],
-            parent_bones: Tuple[bpy.types.Bone, bpy.types.Bone],
+            parent_bones: Tuple[_BoneDesc, _BoneDesc],
             radius: float = 0.1,
             bone_type: str = "other",
-        ) -> Tuple[bpy.types.Bone, bpy.types.Bone]:
-            right_roll = 0
-            left_roll = 0
-            if bone_type == "arm":
-                right_roll = 180
-            elif bone_type == "leg":
-                right_roll = 90
-                left_roll = 90
+        ) -> Tuple[_BoneDesc, _BoneDesc]:
+            left_roll, right_roll = _MIRROR_ROLLS.get(bone_type, (0, 0))
             left_bone = bone_add(
                 "Left" + base_name,
                 right_head_pos,
@@ -180,38 +184,42 @@ class ICYP_OT_MAKE_ARMATURE(bpy.types.Operator):  # type: ignore[misc] # noqa: N
                 roll=left_roll,
             )
 
-            head_pos = [pos * axis for pos, axis in zip(right_head_pos, (-1, 1, 1))]
-            tail_pos = [pos * axis for pos, axis in zip(right_tail_pos, (-1, 1, 1))]
             right_bone = bone_add(
                 "Right" + base_name,
-                (head_pos[0], head_pos[1], head_pos[2]),
-                (tail_pos[0], tail_pos[1], tail_pos[2]),
+                right_head_pos,
+                right_tail_pos,
                 parent_bones[1],
                 radius=radius,
                 roll=right_roll,
             )
+            right_bone.mirrored = True
 
             return left_bone, right_bone
 
         def x_add(
             pos_a: Tuple[float, float, float], add_x: float
         ) -> Tuple[float, float, float]:
-            pos = [p_a + _add for p_a, _add in zip(pos_a, [add_x, 0, 0])]
-            return (pos[0], pos[1], pos[2])
+            return (pos_a[0] + add_x, pos_a[1], pos_a[2])
 
         def y_add(
             pos_a: Tuple[float, float, float], add_y: float
         ) -> Tuple[float, float, float]:
-            pos = [p_a + _add for p_a, _add in zip(pos_a, [0, add_y, 0])]
-            return (pos[0], pos[1], pos[2])
+            return (pos_a[0], pos_a[1] + add_y, pos_a[2])
 
         def z_add(
             pos_a: Tuple[float, float, float], add_z: float
         ) -> Tuple[float, float, float]:
-            pos = [p_a + _add for p_a, _add in zip(pos_a, [0, 0, add_z])]
-            return (pos[0], pos[1], pos[2])
+            return (pos_a[0], pos_a[1], pos_a[2] + add_z)
 
         head_size = self.head_size()
+        hand_size = self.hand_size()
+        arm_radius = hand_size * 0.4
+        hand_radius = hand_size / 4
+        finger_radius = hand_size / 18
+        nail_radius = hand_size / 20
+        half_hand = hand_size / 2
+        # Index and ring fingers, the little finger is a fraction of it
+        short_finger_len = half_hand - (1 / 2.3125) * half_hand / 3
         # down side (前は8頭身の時の股上/股下の股下側割合、後ろは4頭身のときの〃を年齢具合で線形補完)(股上高めにすると破綻する)
         eight_upside_ratio, four_upside_ratio = (
             1 - self.leg_length_ratio,
@@ -324,7 +332,7 @@ class ICYP_OT_MAKE_ARMATURE(bpy.types.Operator):  # type: ignore[misc] # noqa: N
             x_add(shoulder_parent.tail, shoulder_in_pos),
             x_add(shoulder_parent.tail, shoulder_in_pos + self.shoulder_width),
             (shoulder_parent, shoulder_parent),
-            radius=self.hand_size() * 0.4,
+            radius=arm_radius,
             bone_type="arm",
         )
 
@@ -338,60 +346,55 @@ class ICYP_OT_MAKE_ARMATURE(bpy.types.Operator):  # type: ignore[misc] # noqa: N
             shoulders[0].tail,
             x_add(shoulders[0].tail, arm_length),
             shoulders,
-            radius=self.hand_size() * 0.4,
+            radius=arm_radius,
             bone_type="arm",
         )
 
         # グーにするとパーの半分くらいになる、グーのとき手を含む下腕の長さと上腕の長さが概ね一緒、けど手がでかすぎると破綻する
-        forearm_length = max(arm_length - self.hand_size() / 2, arm_length * 0.8)
+        forearm_length = max(arm_length - half_hand, arm_length * 0.8)
         forearms = x_mirror_bones_add(
             "LowerArm",
             arms[0].tail,
             x_add(arms[0].tail, forearm_length),
             arms,
-            radius=self.hand_size() * 0.4,
+            radius=arm_radius,
             bone_type="arm",
         )
         hands = x_mirror_bones_add(
             "Hand",
             forearms[0].tail,
-            x_add(forearms[0].tail, self.hand_size() / 2),
+            x_add(forearms[0].tail, half_hand),
             forearms,
-            radius=self.hand_size() / 4,
+            radius=hand_radius,
             bone_type="arm",
         )
 
+        # Share of each finger segment in the whole finger length, same for all fingers
+        finger_normalize = 1 / (
+            self.finger_1_2_ratio * self.finger_2_3_ratio + self.finger_1_2_ratio + 1
+        )
+        proximal_finger_frac = finger_normalize
+        intermediate_finger_frac = finger_normalize * self.finger_1_2_ratio
+        distal_finger_frac = intermediate_finger_frac * self.finger_2_3_ratio
+
         def fingers(
             finger_name: str,
             proximal_pos: Tuple[float, float, float],
             finger_len_sum: float,
         ) -> Tuple[
-            Tuple[bpy.types.Bone, bpy.types.Bone],
-            Tuple[bpy.types.Bone, bpy.types.Bone],
-            Tuple[bpy.types.Bone, bpy.types.Bone],
+            Tuple[_BoneDesc, _BoneDesc],
+            Tuple[_BoneDesc, _BoneDesc],
+            Tuple[_BoneDesc, _BoneDesc],
         ]:
-
-            finger_normalize = 1 / (
-                self.finger_1_2_ratio * self.finger_2_3_ratio
-                + self.finger_1_2_ratio
-                + 1
-            )
-            proximal_finger_len = finger_len_sum * finger_normalize
-            intermediate_finger_len = (
-                finger_len_sum * finger_normalize * self.finger_1_2_ratio
-            )
-            distal_finger_len = (
-                finger_len_sum
-                * finger_normalize
-                * self.finger_1_2_ratio
-                * self.finger_2_3_ratio
-            )
+            proximal_finger_len = finger_len_sum * proximal_finger_frac
+            intermediate_finger_len = finger_len_sum * intermediate_finger_frac
+            distal_finger_len = finger_len_sum * distal_finger_frac
             proximal_bones = x_mirror_bones_add(
                 f"{finger_name}Proximal",
                 proximal_pos,
                 x_add(proximal_pos, proximal_finger_len),
                 hands,
-                self.hand_size() / 18,
+                finger_radius,
                 bone_type="arm",
             )
             intermediate_bones = x_mirror_bones_add(
@@ -399,7 +402,7 @@ class ICYP_OT_MAKE_ARMATURE(bpy.types.Operator):  # type: ignore[misc] # noqa: N
                 proximal_bones[0].tail,
                 x_add(proximal_bones[0].tail, intermediate_finger_len),
                 proximal_bones,
-                self.hand_size() / 18,
+                finger_radius,
                 bone_type="arm",
             )
             distal_bones = x_mirror_bones_add(
@@ -407,7 +410,7 @@ class ICYP_OT_MAKE_ARMATURE(bpy.types.Operator):  # type: ignore[misc] # noqa: N
                 intermediate_bones[0].tail,
                 x_add(intermediate_bones[0].tail, distal_finger_len),
                 intermediate_bones,
-                self.hand_size() / 18,
+                finger_radius,
                 bone_type="arm",
             )
             if self.nail_bone:
@@ -416,91 +419,122 @@ class ICYP_OT_MAKE_ARMATURE(bpy.types.Operator):  # type: ignore[misc] # noqa: N
                     distal_bones[0].tail,
                     x_add(distal_bones[0].tail, distal_finger_len),
                     distal_bones,
-                    self.hand_size() / 20,
+                    nail_radius,
                     bone_type="arm",
                 )
             return proximal_bones, intermediate_bones, distal_bones
 
-        finger_y_offset = -self.hand_size() / 16
+        finger_y_offset = -hand_size / 16
         thumbs = fingers(
             "Thumb",
             y_add(hands[0].head, finger_y_offset * 3),
-            self.hand_size() / 2,
+            half_hand,
         )
 
-        mats = [thumbs[0][i].matrix.translation for i in [0, 1]]
-        mats = [Matrix.Translation(mat) for mat in mats]
-        for j in range(3):
-            for n, angle in enumerate([-45, 45]):
-                thumbs[j][n].transform(mats[n].inverted(), scale=False, roll=False)
-                thumbs[j][n].transform(Matrix.Rotation(radians(angle), 4, "Z"))
-                thumbs[j][n].transform(mats[n], scale=False, roll=False)
-                thumbs[j][n].roll = [0, radians(180)][n]
-
         index_fingers = fingers(
             "Index",
             y_add(hands[0].tail, finger_y_offset * 3),
-            (self.hand_size() / 2) - (1 / 2.3125) * (self.hand_size() / 2) / 3,
+            short_finger_len,
         )
         middle_fingers = fingers(
-            "Middle", y_add(hands[0].tail, finger_y_offset), self.hand_size() / 2
+            "Middle", y_add(hands[0].tail, finger_y_offset), half_hand
         )
         ring_fingers = fingers(
             "Ring",
             y_add(hands[0].tail, -finger_y_offset),
-            (self.hand_size() / 2) - (1 / 2.3125) * (self.hand_size() / 2) / 3,
+            short_finger_len,
         )
         little_fingers = fingers(
             "Little",
             y_add(hands[0].tail, -finger_y_offset * 3),
-            ((self.hand_size() / 2) - (1 / 2.3125) * (self.hand_size() / 2) / 3)
-            * ((1 / 2.3125) + (1 / 2.3125) * 0.75),
+            short_finger_len * ((1 / 2.3125) + (1 / 2.3125) * 0.75),
         )
 
-        body_dict = {
-            "hips": hips.name,
-            "spine": spine.name,
-            "chest": chest.name,
-            "neck": neck.name,
-            "head": head.name,
-        }
+        # Bone positions as (N, 3) arrays, one row per planned bone
+        heads = numpy.array([desc.head for desc in bone_descs], dtype=numpy.float64)
+        tails = numpy.array([desc.tail for desc in bone_descs], dtype=numpy.float64)
+        # Flip all the right side bones across X at once
+        mirrored = numpy.array([desc.mirrored for desc in bone_descs], dtype=bool)
+        heads[mirrored] *= _MIRROR_X
+        tails[mirrored] *= _MIRROR_X
+
+        # Create all the edit bones, then set them up, then link the parents
+        edit_bones = armature.data.edit_bones
+        for desc in bone_descs:
+            desc.bone = edit_bones.new(desc.name)
+        for desc, head_pos, tail_pos in zip(bone_descs, heads, tails):
+            added_bone = desc.bone
+            added_bone.head = head_pos
+            added_bone.tail = tail_pos
+            added_bone.head_radius = desc.radius
+            added_bone.tail_radius = desc.radius
+            added_bone.envelope_distance = 0.01
+            added_bone.roll = radians(desc.roll)
+        for desc in bone_descs:
+            if desc.parent is not None:
+                desc.bone.parent = desc.parent.bone
+
+        # Thumbs are rotated around their root, which needs the real bones
+        # Same for every thumb bone of a side, so build them once
+        left_mat = Matrix.Translation(thumbs[0][0].bone.matrix.translation)
+        right_mat = Matrix.Translation(thumbs[0][1].bone.matrix.translation)
+        left_inv_mat = left_mat.inverted()
+        right_inv_mat = right_mat.inverted()
+        left_rot_mat = Matrix.Rotation(_R_NEG45, 4, "Z")
+        right_rot_mat = Matrix.Rotation(_R_45, 4, "Z")
+        for left_thumb, right_thumb in thumbs:
+            left_bone = left_thumb.bone
+            left_bone.transform(left_inv_mat, scale=False, roll=False)
+            left_bone.transform(left_rot_mat)
+            left_bone.transform(left_mat, scale=False, roll=False)
+            left_bone.roll = 0
+
+            right_bone = right_thumb.bone
+            right_bone.transform(right_inv_mat, scale=False, roll=False)
+            right_bone.transform(right_rot_mat)
+            right_bone.transform(right_mat, scale=False, roll=False)
+            right_bone.roll = _R_180
 
-        left_right_body_dict = {
-            f"{left_right}{bone_name}": bones[lr].name
-            for bone_name, bones in {
-                "Eye": eyes,
-                "UpperLeg": upside_legs,
-                "LowerLeg": lower_legs,
-                "Foot": foots,
-                "Toes": toes,
-                "Shoulder": shoulders,
-                "UpperArm": arms,
-                "LowerArm": forearms,
-                "Hand": hands,
-            }.items()
-            for lr, left_right in enumerate(["left", "right"])
+        # VRM bone name : blender bone name
+        bone_name_all_dict = {
+            "hips": hips.bone.name,
+            "spine": spine.bone.name,
+            "chest": chest.bone.name,
+            "neck": neck.bone.name,
+            "head": head.bone.name,
         }
 
-        # VRM finger like name key
-        fingers_dict = {
-            f"{left_right}{finger_name}{position}": finger[i][lr].name
-            for finger_name, finger in zip(
-                ["Thumb", "Index", "Middle", "Ring", "Little"],
-                [thumbs, index_fingers, middle_fingers, ring_fingers, little_fingers],
-            )
-            for i, position in enumerate(["Proximal", "Intermediate", "Distal"])
-            for lr, left_right in enumerate(["left", "right"])
-        }
+        for bone_name, bones in (
+            ("Eye", eyes),
+            ("UpperLeg", upside_legs),
+            ("LowerLeg", lower_legs),
+            ("Foot", foots),
+            ("Toes", toes),
+            ("Shoulder", shoulders),
+            ("UpperArm", arms),
+            ("LowerArm", forearms),
+            ("Hand", hands),
+        ):
+            for left_right, lr in _LR_INDEX:
+                bone_name_all_dict[f"{left_right}{bone_name}"] = bones[lr].bone.name
 
-        # VRM bone name : blender bone name
-        bone_name_all_dict = {}
-        bone_name_all_dict.update(body_dict)
-        bone_name_all_dict.update(left_right_body_dict)
-        bone_name_all_dict.update(fingers_dict)
+        # VRM finger like name key
+        for finger_name, finger in (
+            ("Thumb", thumbs),
+            ("Index", index_fingers),
+            ("Middle", middle_fingers),
+            ("Ring", ring_fingers),
+            ("Little", little_fingers),
+        ):
+            for i, position in enumerate(("Proximal", "Intermediate", "Distal")):
+                for left_right, lr in _LR_INDEX:
+                    bone_name_all_dict[
+                        f"{left_right}{finger_name}{position}"
+                    ] = finger[i][lr].bone.name
 
         connect_parent_tail_and_child_head_if_same_position(armature.data)
 
-        context.scene.view_layers.update()
+        # Leaving edit mode already syncs the bones, one update afterwards is enough
         bpy.ops.object.mode_set(mode="OBJECT")
         context.scene.view_layers.update()
         return armature, bone_name_all_dict
@@ -515,32 +549,24 @@ class ICYP_OT_MAKE_ARMATURE(bpy.types.Operator):  # type: ignore[misc] # noqa: N
     @classmethod
     def make_extension_setting_and_metas(cls, armature: bpy.types.Object) -> None:
         def write_textblock_and_assign_to_armature(
-            block_name: str, value: Union[Dict[str, Any], List[Dict[str, Any]]]
+            block_name: str, value_json: str
         ) -> None:
             text_block = bpy.data.texts.new(name=f"{armature.name}_{block_name}.json")
-            text_block.write(json.dumps(value, indent=4))
+            text_block.write(value_json)
             if block_name not in armature:
                 armature[f"{block_name}"] = text_block.name
 
-        # param_dicts are below of this method
-        write_textblock_and_assign_to_armature(
-            "humanoid_params", ICYP_OT_MAKE_ARMATURE.humanoid_params
-        )
-        write_textblock_and_assign_to_armature(
-            "firstPerson_params", ICYP_OT_MAKE_ARMATURE.first_person_params
-        )
-        write_textblock_and_assign_to_armature(
-            "blendshape_group", ICYP_OT_MAKE_ARMATURE.blendshape_group
-        )
-        write_textblock_and_assign_to_armature(
-            "spring_bone", ICYP_OT_MAKE_ARMATURE.spring_bone_prams
-        )
+        # param_dicts are below of this method, serialized once in _PARAMS_JSON
+        for block_name, value_json in _PARAMS_JSON:
+            write_textblock_and_assign_to_armature(block_name, value_json)
 
+        # One keys() call instead of an ID property lookup per meta
+        existing_keys = set(armature.keys())
         for v in Vrm0.METAS:
-            if v not in armature:
+            if v not in existing_keys:
                 armature[v] = "undefined"
         for k, v in Vrm0.REQUIRED_METAS.items():
-            if k not in armature:
+            if k not in existing_keys:
                 armature[k] = v
 
     humanoid_params = Vrm0.HUMANOID_DEFAULT_PARAMS
@@ -708,14 +734,32 @@ class ICYP_OT_MAKE_ARMATURE(bpy.types.Operator):  # type: ignore[misc] # noqa: N
     ]
 
 
+# Default text blocks of a new VRM armature, as (block name, JSON text)
+_PARAMS_JSON: Tuple[Tuple[str, str], ...] = tuple(
+    (block_name, json.dumps(value, indent=4))
+    for block_name, value in (
+        ("humanoid_params", ICYP_OT_MAKE_ARMATURE.humanoid_params),
+        ("firstPerson_params", ICYP_OT_MAKE_ARMATURE.first_person_params),
+        ("blendshape_group", ICYP_OT_MAKE_ARMATURE.blendshape_group),
+        ("spring_bone", ICYP_OT_MAKE_ARMATURE.spring_bone_prams),
+    )
+)
+
+
 def connect_parent_tail_and_child_head_if_same_position(
     armature: bpy.types.Object,
 ) -> None:
     for bone in armature.edit_bones:
+        parent = bone.parent
+        if parent is None:
+            continue
         # 親ボーンがある場合かつ、ボーンのヘッドと親ボーンのテールが一致していたら
-        if (
-            bone.parent is not None
-            and (bone.head - bone.parent.tail).length < 0.000001  # 1μm
-        ):
+        # Compare squared distances to skip the Vector allocation and sqrt
+        head = bone.head
+        tail = parent.tail
+        dx = head[0] - tail[0]
+        dy = head[1] - tail[1]
+        dz = head[2] - tail[2]
+        if dx * dx + dy * dy + dz * dz < 0.000001 ** 2:  # 1μm
             # ボーンの関係の接続を有効に
             bone.use_connect = True
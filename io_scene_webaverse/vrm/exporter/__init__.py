@@ -3,6 +3,7 @@ from typing import Set, cast
 import bpy
 from bpy_extras.io_utils import ExportHelper
 
+from ...io.exp import gltf2_io_upload
 from ..editor import validation
 from ..preferences import get_preferences, use_legacy_importer_exporter
 from .glb_obj import GlbObj
@@ -62,29 +63,10 @@ class ExportVRM(bpy.types.Operator, ExportHelper):  # type: ignore[misc]
             return {"CANCELLED"}
         with open(filepath, "wb") as f:
             f.write(vrm_bin)
-            
-        print("got req 1 " + str(len(vrm_bin)))
-        # import requests
-        # r = requests.post("https://ipfs.exokit.org/", data = vrm_bin)
-        # print(r.json())
-        
-        # print_console('ERROR', str(file.name));
-        with open(filepath, 'rb') as f:
-            data = f.read()
-            print("got req 2 " + str(len(data)))
-            # print_console('ERROR', str(data));
-            r = requests.post('https://ipfs.exokit.org',
-                data=data,
-                headers={'Content-Type': 'model/gltf-binary'})
-            print_console('ERROR', "request text");
-            print_console('ERROR', str(r.text));
-            resJson = r.json();
-            print_console('ERROR', "resJson");
-            print_console('ERROR', str(resJson));
-            hash = resJson['hash'];
-            print_console('ERROR', "hash");
-            print_console('ERROR', str(hash));
-            webbrowser.open('https://app.webaverse.com/preview.html?hash=' + hash + '&ext=vrm', new=2)
+
+        # Upload the bytes we hold rather than the file, which a later export may overwrite.
+        # Runs in the background, the preview opens once the upload is done
+        gltf2_io_upload.upload(vrm_bin, 'model/gltf-binary', 'vrm')
 
         return {"FINISHED"}
 
@@ -0,0 +1,41 @@
+import os
+
+import pytest
+
+# The exporter package needs Blender's Python modules
+pytest.importorskip("bpy")
+pytest.importorskip("numpy")
+
+from io_scene_webaverse.io.exp import gltf2_io_export  # noqa: E402
+
+
+def test_write_buffers_more_fragments_than_iov_max(tmp_path):
+    path = str(tmp_path / "out.bin")
+    buffers = [bytes([i % 256]) * 4 for i in range(2000)]
+
+    gltf2_io_export._write_buffers(path, buffers)
+
+    with open(path, "rb") as file:
+        assert file.read() == b"".join(buffers)
+
+
+@pytest.mark.skipif(not hasattr(os, "writev"), reason="needs os.writev")
+def test_write_buffers_batches_and_short_writes(tmp_path, monkeypatch):
+    path = str(tmp_path / "out.bin")
+    buffers = [bytes([i % 256]) * 3 for i in range(50)]
+    real_writev = os.writev
+    batch_sizes = []
+
+    def short_writev(fd, views):
+        batch_sizes.append(len(views))
+        # Stop in the middle of the second buffer
+        return real_writev(fd, [bytes(views[0]), bytes(views[1])[:1]] if len(views) > 1 else views)
+
+    monkeypatch.setattr(gltf2_io_export, "_iov_max", lambda: 8)
+    monkeypatch.setattr(os, "writev", short_writev)
+
+    gltf2_io_export._write_buffers(path, buffers)
+
+    assert max(batch_sizes) <= 8
+    with open(path, "rb") as file:
+        assert file.read() == b"".join(buffers)
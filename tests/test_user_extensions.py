@@ -0,0 +1,75 @@
+import sys
+import types
+
+import pytest
+
+# The addon package needs Blender's Python modules
+pytest.importorskip("bpy")
+pytest.importorskip("numpy")
+
+import io_scene_webaverse  # noqa: E402
+
+
+class LegacyExtension:
+    pass
+
+
+class NewExtension:
+    pass
+
+
+def legacy_pre(export_settings):
+    pass
+
+
+def new_post(export_settings):
+    pass
+
+
+@pytest.fixture
+def addons(monkeypatch):
+    # Two enabled addons exposing the legacy module attributes
+    legacy = types.ModuleType("legacy_addon")
+    legacy.glTF2ExportUserExtension = LegacyExtension
+    legacy.glTF2_pre_export_callback = legacy_pre
+    registering = types.ModuleType("new_addon")
+    registering.glTF2ExportUserExtension = LegacyExtension
+    monkeypatch.setitem(sys.modules, "legacy_addon", legacy)
+    monkeypatch.setitem(sys.modules, "new_addon", registering)
+
+    preferences = types.SimpleNamespace(addons={"legacy_addon": None, "new_addon": None})
+    fake_bpy = types.SimpleNamespace(context=types.SimpleNamespace(preferences=preferences))
+    monkeypatch.setattr(io_scene_webaverse, "bpy", fake_bpy)
+    monkeypatch.setattr(io_scene_webaverse, "_REGISTERED_EXTENSIONS", [])
+
+
+def test_legacy_scan(addons):
+    ctors, panels, pre, post = io_scene_webaverse._collect_user_extensions()
+    assert ctors == [LegacyExtension, LegacyExtension]
+    assert pre == [legacy_pre]
+    assert post == []
+
+
+def test_register_collect_unregister(addons):
+    handle = io_scene_webaverse.register_user_extension("new_addon", extension_ctor=NewExtension, post=new_post)
+
+    ctors, panels, pre, post = io_scene_webaverse._collect_user_extensions()
+    # The registering addon is left out of the scan, the legacy one is still found
+    assert ctors == [NewExtension, LegacyExtension]
+    assert pre == [legacy_pre]
+    assert post == [new_post]
+
+    io_scene_webaverse.unregister_user_extension(handle)
+    ctors, panels, pre, post = io_scene_webaverse._collect_user_extensions()
+    assert ctors == [LegacyExtension, LegacyExtension]
+    assert post == []
+
+
+def test_register_needs_a_hook(addons):
+    with pytest.raises(TypeError):
+        io_scene_webaverse.register_user_extension("new_addon")
+
+
+def test_register_needs_an_addon_name(addons):
+    with pytest.raises(TypeError):
+        io_scene_webaverse.register_user_extension(None, pre=legacy_pre)